@@ -14,16 +14,20 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import hashlib
 import json
+import os
+import sys
 from enum import Enum
+from importlib.metadata import version
 from pathlib import Path
 from subprocess import CalledProcessError
 from typing import Any
 
-from aexpy.models.difference import BreakingRank
+from pydantic.dataclasses import dataclass
 
 from .api_processor import APIProcessor, CannotFindAPIVersionError
-from .constants import PYAPI_BUILD_DIR
+from .constants import PYAPI_BUILD_DIR, PYAPI_CACHE_SOURCE_API_ENV_VAR
 from .utils import run
 
 SOURCE_VERSION_STR = "source"
@@ -34,22 +38,48 @@ class PreprocessMode(Enum):
     SOURCE = "-s"
 
 
+@dataclass
+class BaselineAPI:
+    """
+    The extracted API of a previously published version, which can be passed to an
+    `AexpyAPIProcessor` to skip downloading and extracting that version again.
+    """
+
+    project_name: str
+    version: str
+    extracted_api: Path
+    top_level_packages: list[str]
+
+
 class AexpyAPIProcessor(APIProcessor):
-    def __init__(self, project_path: Path, project_name: str, python_index: str):
+    def __init__(self, project_path: Path, project_name: str, python_index: str, baseline: BaselineAPI | None = None):
         self._project_path = project_path
         self._python_index = python_index
         self._build_dir = self._project_path / PYAPI_BUILD_DIR
         self._project_name = project_name
+        if baseline is not None and baseline.project_name != project_name:
+            raise RuntimeError(
+                f"Baseline API was extracted from {baseline.project_name}, cannot use it to check {project_name}."
+            )
+        self._baseline = baseline
 
     def check_api(self, previous_version: str) -> list[str]:
+        baseline = self._get_baseline(previous_version)
+        extracted_source = self._extract_source(baseline.top_level_packages)
+        diff_output = self._diff(baseline.extracted_api, extracted_source, previous_version)
+        return self._parse_diff(diff_output)
+
+    def extract_baseline(self, previous_version: str) -> BaselineAPI:
         wheel = self._download_wheel(self._project_path.name, previous_version)
         preprocessed_wheel = self._preprocess_wheel(wheel, previous_version)
         top_level_packages_from_wheel = self._get_top_level_packages_from_preprocessed(preprocessed_wheel)
-        preprocessed_source = self._preprocess_source(top_level_packages_from_wheel)
         extracted_wheel = self._extract_from_preprocessed_wheel(preprocessed_wheel, previous_version)
-        extracted_source = self._extract_from_preprocessed_source(preprocessed_source)
-        diff_output = self._diff(extracted_wheel, extracted_source, previous_version)
-        return self._parse_diff(diff_output)
+        return BaselineAPI(self._project_name, previous_version, extracted_wheel, top_level_packages_from_wheel)
+
+    def _get_baseline(self, previous_version: str) -> BaselineAPI:
+        if self._baseline is not None and self._baseline.version == previous_version:
+            return self._baseline
+        return self.extract_baseline(previous_version)
 
     def _download_wheel(self, package_name: str, version: str) -> Path:
         download_dir = self._build_dir / "downloads"
@@ -97,6 +127,7 @@ class AexpyAPIProcessor(APIProcessor):
     def _preprocess(
         self, mode: PreprocessMode, input: Path, version_str: str, top_level_packages: list[str] | None = None
     ) -> Path:
+        self._build_dir.mkdir(parents=True, exist_ok=True)
         preprocessed_output = self._build_dir / f"preprocessed-{self._project_path.name}-{version_str}.json"
         command = ["preprocess", mode.value, str(input), str(preprocessed_output)]
         if top_level_packages:
@@ -119,8 +150,34 @@ class AexpyAPIProcessor(APIProcessor):
             )
         return maybe_top_level_packages
 
-    def _extract_from_preprocessed_source(self, preprocessed_output: Path) -> Path:
-        return self._extract_from_preprocessed(preprocessed_output, SOURCE_VERSION_STR)
+    # When opted in via PYAPI_CACHE_SOURCE_API the extracted source is cached under a hash of the source
+    # files, aexpy's version and the Python version so that unchanged sources are not extracted again.
+    def _extract_source(self, top_level_packages: list[str]) -> Path:
+        if not os.getenv(PYAPI_CACHE_SOURCE_API_ENV_VAR):
+            preprocessed_source = self._preprocess_source(top_level_packages)
+            return self._extract_from_preprocessed(preprocessed_source, SOURCE_VERSION_STR)
+        source_version_str = f"{SOURCE_VERSION_STR}-{self._hash_source(top_level_packages)}"
+        extracted_output = self._build_dir / f"extracted-{self._project_path.name}-{source_version_str}.json"
+        if extracted_output.exists():
+            return extracted_output
+        preprocessed_source = self._preprocess_source(top_level_packages)
+        return self._extract_from_preprocessed(
+            preprocessed_source, source_version_str, f"extracted-{self._project_path.name}-{SOURCE_VERSION_STR}-*.json"
+        )
+
+    def _hash_source(self, top_level_packages: list[str]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"aexpy=={version('aexpy')}\0python=={sys.version_info}\0".encode("utf-8"))
+        for package in sorted(top_level_packages):
+            package_path = self._project_path / package
+            if package_path.is_dir():
+                source_files = sorted(file for file in package_path.rglob("*") if file.suffix in (".py", ".pyi"))
+            else:
+                source_files = [package_path.with_suffix(".py")]
+            for source_file in filter(Path.is_file, source_files):
+                digest.update(source_file.relative_to(self._project_path).as_posix().encode("utf-8") + b"\0")
+                digest.update(source_file.read_bytes())
+        return digest.hexdigest()
 
     def _extract_from_preprocessed_wheel(self, preprocessed_output: Path, version: str) -> Path:
         return self._extract_from_preprocessed(
@@ -145,7 +202,6 @@ class AexpyAPIProcessor(APIProcessor):
 
     def _diff(self, extracted1: Path, extracted2: Path, version: str) -> Path:
         diff_output = self._build_dir / f"diff-{self._project_path.name}-{version}.json"
-        # TODO(BenjaminLowry): hash source files so we can use old preprocessed and diff files for efficiency.
         # Remove previous diff json files.
         for file in self._build_dir.glob(f"diff-{self._project_path.name}-*.*.*.json"):
             file.unlink()
@@ -153,6 +209,9 @@ class AexpyAPIProcessor(APIProcessor):
         return diff_output
 
     def _parse_diff(self, diff_output: Path) -> list[str]:
+        # Importing aexpy's models is slow and only needed here, so defer it until a diff is actually parsed.
+        from aexpy.models.difference import BreakingRank
+
         diff_json: dict[str, Any] = json.loads(diff_output.read_text())
         maybe_entries = diff_json.get("entries")
         if maybe_entries is None:
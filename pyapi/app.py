@@ -23,7 +23,7 @@ from pathlib import Path
 import tomli
 import yaml
 
-from .aexpy_api_processor import AexpyAPIProcessor
+from .aexpy_api_processor import AexpyAPIProcessor, BaselineAPI
 from .api_processor import CannotFindAPIVersionError
 from .color import ANSIColor
 from .config import PyAPICheckerConfig
@@ -38,11 +38,11 @@ from .constants import (
 )
 from .git import get_git_version, get_previous_git_tag_from_HEAD, get_repo_root
 from .model import AcceptedAPIBreak, PyAPIYml
-from .utils import maybe_get_nested_value, print_with_local_color
+from .utils import load_yaml, maybe_get_nested_value, print_with_local_color
 
 
 class PyAPIApplication:
-    def __init__(self, project_dir: Path) -> None:
+    def __init__(self, project_dir: Path, baseline: BaselineAPI | None = None) -> None:
         self._project_dir = project_dir
         self._pyproject_path = self._project_dir / PYPROJECT_TOML
         self._pyproject_toml = tomli.loads((self._pyproject_path).read_text())
@@ -61,7 +61,7 @@ class PyAPIApplication:
             or os.getenv(UV_DEFAULT_INDEX_ENV_VAR)
             or PYPI_INDEX_URL
         )
-        self._processor = AexpyAPIProcessor(self._project_dir, self._project_name, self._index)
+        self._processor = AexpyAPIProcessor(self._project_dir, self._project_name, self._index, baseline)
         self._pyapi_yml_path = self._repo_root / PYAPI_YML_PATH
 
     @cached_property
@@ -77,7 +77,7 @@ class PyAPIApplication:
     def _pyapi_yml_contents(self) -> PyAPIYml:
         if not self._pyapi_yml_path.exists():
             return PyAPIYml({}, {})
-        pyapi_yml = yaml.safe_load(self._pyapi_yml_path.read_text())
+        pyapi_yml = load_yaml(self._pyapi_yml_path.read_text())
         if not isinstance(pyapi_yml, dict):
             raise RuntimeError(f"{self._pyapi_yml_path} is not valid yaml, cannot read to dict.")
         try:
@@ -17,6 +17,7 @@ limitations under the License.
 DOT_PALANTIR_DIR = ".palantir"
 PIP_INDEX_URL_ENV_VAR = "PIP_INDEX_URL"
 PYAPI_BUILD_DIR = "build/pyapi"
+PYAPI_CACHE_SOURCE_API_ENV_VAR = "PYAPI_CACHE_SOURCE_API"
 PYAPI_CHECKER_CONFIG_KEY = "pyapi-checker"
 PYAPI_YML_FILENAME = "pyapi.yml"
 PYAPI_YML_PATH = f"{DOT_PALANTIR_DIR}/{PYAPI_YML_FILENAME}"
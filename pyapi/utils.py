@@ -18,8 +18,15 @@ import os
 import subprocess
 from typing import Any
 
+import yaml
+
 from .color import ANSIColor
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML was built without libyaml.
+    from yaml import SafeLoader as YamlSafeLoader  # type: ignore[assignment]
+
 
 def maybe_get_nested_value(keys: list[str], d: dict[str, Any]) -> Any | None:
     if len(keys) == 1:
@@ -41,6 +48,14 @@ def run(args: list[str]) -> str:
     return res.stdout.decode("utf-8")
 
 
+def load_yaml(stream: str | bytes) -> Any:
+    """
+    Equivalent to `yaml.safe_load` but uses the libyaml backed loader when it is available,
+    which parses considerably faster than the pure Python loader.
+    """
+    return yaml.load(stream, Loader=YamlSafeLoader)
+
+
 def merge_dicts(dict1: dict[Any, Any], dict2: dict[Any, Any], root_key: str | None = None) -> dict[Any, Any]:
     """
     Merges dictionaries together recursively where key, value pairs in dict2 override key, value
@@ -16,14 +16,28 @@ limitations under the License.
 
 import os
 import shutil
+import subprocess
+from functools import reduce
 from pathlib import Path
-from subprocess import run
-from typing import Any, Iterator
-from unittest.mock import MagicMock, Mock, patch
+from subprocess import CalledProcessError, CompletedProcess, run
+from typing import Any, NamedTuple, Protocol
+from unittest.mock import MagicMock
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import importlib_resources
 import pytest
-from pytest import TempPathFactory
+from pytest import MonkeyPatch, TempPathFactory
+
+from pyapi.aexpy_api_processor import AexpyAPIProcessor, BaselineAPI
+from pyapi.constants import (
+    DOT_PALANTIR_DIR,
+    PIP_INDEX_URL_ENV_VAR,
+    PYAPI_BUILD_DIR,
+    PYAPI_YML_PATH,
+    PYPI_INDEX_URL,
+    UV_DEFAULT_INDEX_ENV_VAR,
+)
 
 
 @pytest.fixture(scope="session")
@@ -42,41 +56,144 @@ def pyapi_lib_wheel(tmp_path_factory: TempPathFactory) -> Path:
     return built_wheel
 
 
+@pytest.fixture(scope="session")
+def local_python_index(tmp_path_factory: TempPathFactory, pyapi_lib_wheel: Path) -> Path:
+    """
+    A local index laid out as `<index>/<project>/<wheel>` which only serves the built 1.0.0 wheel of the test lib.
+    The `test_lib` fixture's fake pip resolves downloads against it.
+    """
+    index_dir = tmp_path_factory.mktemp("index_tmp_dir")
+    project_index_dir = index_dir / "test-pyapi-lib"
+    project_index_dir.mkdir()
+    shutil.copy(pyapi_lib_wheel, project_index_dir)
+    return index_dir
+
+
+@pytest.fixture(scope="session")
+def test_lib_template(tmp_path_factory: TempPathFactory) -> Path:
+    """
+    A repo root containing the test lib, set up once per session and never modified.
+    Tests get their own copy of it via the `test_lib` fixture.
+    """
+    template_dir = tmp_path_factory.mktemp("template_tmp_dir")
+    shutil.copytree(str(importlib_resources.files("tests").joinpath("test-pyapi-lib")), template_dir / "test-pyapi-lib")
+
+    # Tests write their existing pyapi.yml straight into .palantir, the app creates it if missing either way.
+    (template_dir / DOT_PALANTIR_DIR).mkdir()
+    return template_dir
+
+
+@pytest.fixture(scope="session")
+def baseline_api_snapshot(
+    tmp_path_factory: TempPathFactory, test_lib_template: Path, pyapi_lib_wheel: Path
+) -> BaselineAPI:
+    repo_dir = tmp_path_factory.mktemp("baseline_tmp_dir")
+    shutil.copytree(test_lib_template, repo_dir, dirs_exist_ok=True)
+    project_dir = repo_dir / "test-pyapi-lib"
+
+    # Stage the built wheel as if it had already been downloaded so no index is queried.
+    download_dir = project_dir / PYAPI_BUILD_DIR / "downloads"
+    download_dir.mkdir(parents=True)
+    shutil.copy(pyapi_lib_wheel, download_dir)
+    return AexpyAPIProcessor(project_dir, "test-pyapi-lib", PYPI_INDEX_URL).extract_baseline("1.0.0")
+
+
+@pytest.fixture(scope="session")
+def test_lib_baselines() -> dict[str, bytes]:
+    package_dir = importlib_resources.files("tests").joinpath("test-pyapi-lib/test_pyapi_lib")
+    return {name: package_dir.joinpath(name).read_bytes() for name in ("animals.py", "functions.py")}
+
+
+class PyAPITestLib(NamedTuple):
+    path: Path
+    pyapi_yml_path: Path
+    index_url: str
+
+
+class MutateFile(Protocol):
+    def __call__(self, path: Path, *edits: tuple[bytes, bytes]) -> None: ...
+
+
 @pytest.fixture()
-def test_lib(tmp_path: Path, pyapi_lib_wheel: Path, request: pytest.FixtureRequest) -> Iterator[tuple[Path, MagicMock]]:
-    current_git_version: bytes = getattr(request, "param", {}).get("current_git_version", b"1.0.0-3-g0a549f3")
+def mutate(test_lib_baselines: dict[str, bytes]) -> MutateFile:
+    """
+    Overwrites the file at `path` with its baseline contents with each `(old, new)` edit applied in order,
+    so a test only ever writes a mutated source file once and never reads it back from disk.
+    """
+
+    def mutate_file(path: Path, *edits: tuple[bytes, bytes]) -> None:
+        def apply_edit(contents: bytes, edit: tuple[bytes, bytes]) -> bytes:
+            old, new = edit
+            assert old in contents, f"{old!r} not found in {path.name}"
+            return contents.replace(old, new)
+
+        path.write_bytes(reduce(apply_edit, edits, test_lib_baselines[path.name]))
+
+    return mutate_file
 
+
+@pytest.fixture()
+def test_lib(
+    tmp_path: Path,
+    test_lib_template: Path,
+    local_python_index: Path,
+    monkeypatch: MonkeyPatch,
+    request: pytest.FixtureRequest,
+) -> PyAPITestLib:
+    current_git_version: bytes = getattr(request, "param", {}).get("current_git_version", b"1.0.0-3-g0a549f3")
+    shutil.copytree(test_lib_template, tmp_path, dirs_exist_ok=True)
     project_dir = tmp_path / "test-pyapi-lib"
-    shutil.copytree(str(importlib_resources.files("tests").joinpath("test-pyapi-lib")), project_dir)
 
-    with patch("subprocess.run") as mock_run:
-
-        def mock_different_calls(*args: Any, **kwargs: Any) -> Any:
-            command = kwargs["args"]
-            mock_process = Mock()
-
-            if command[:2] == ["git", "rev-parse"]:
-                mock_process.stdout = f"{project_dir.parent}\n".encode("utf-8")
-                return mock_process
-            elif command[:4] == ["git", "describe", "--tags", "--abbrev=0"]:
-                mock_process.stdout = b"1.0.0\n"
-                return mock_process
-            elif command[:4] == ["git", "describe", "--tags", "--always"]:
-                mock_process.stdout = current_git_version
-                return mock_process
-            elif command[:2] == ["git", "status"]:
-                mock_process.stdout = b""
-                return mock_process
-            elif command[:3] == ["python3", "-m", "pip"]:
-                download_dir = Path(command[-1])
-                shutil.copy(
-                    pyapi_lib_wheel,
-                    download_dir,
+    def mock_different_calls(*args: Any, **kwargs: Any) -> Any:
+        command = kwargs["args"]
+
+        if command[:2] == ["git", "rev-parse"]:
+            return CompletedProcess(command, 0, stdout=f"{project_dir.parent}\n".encode("utf-8"))
+        elif command[:4] == ["git", "describe", "--tags", "--abbrev=0"]:
+            return CompletedProcess(command, 0, stdout=b"1.0.0\n")
+        elif command[:4] == ["git", "describe", "--tags", "--always"]:
+            return CompletedProcess(command, 0, stdout=current_git_version)
+        elif command[:2] == ["git", "status"]:
+            return CompletedProcess(command, 0, stdout=b"")
+        elif command[:3] == ["python3", "-m", "pip"]:
+            # Resolve the requirement against the local index rather than letting pip touch the network.
+            name, version = command[4].split("==")
+            index_dir = Path(url2pathname(urlparse(command[command.index("--index-url") + 1]).path))
+            wheels = list((index_dir / name).glob(f"{name.replace('-', '_')}-{version}-*.whl"))
+            if not wheels:
+                # What pip itself reports when the index has no matching version.
+                raise CalledProcessError(
+                    1,
+                    command,
+                    output=b"",
+                    stderr=(
+                        f"ERROR: Could not find a version that satisfies the requirement {command[4]}\n"
+                        f"ERROR: No matching distribution found for {command[4]}\n"
+                    ).encode("utf-8"),
                 )
-                return mock_process
-            else:
-                return run(*args, **kwargs)
+            for wheel in wheels:
+                shutil.copy(wheel, Path(command[-1]))
+            return CompletedProcess(command, 0, stdout=b"")
+        else:
+            return run(*args, **kwargs)
 
-        mock_run.side_effect = mock_different_calls
+    index_url = local_python_index.as_uri()
+    monkeypatch.setenv(PIP_INDEX_URL_ENV_VAR, index_url)
+    monkeypatch.delenv(UV_DEFAULT_INDEX_ENV_VAR, raising=False)
+    monkeypatch.setattr(subprocess, "run", mock_different_calls)
 
-        yield project_dir, mock_run
+    return PyAPITestLib(
+        path=project_dir,
+        pyapi_yml_path=tmp_path / PYAPI_YML_PATH,
+        index_url=index_url,
+    )
+
+
+@pytest.fixture()
+def test_lib_mock_run(test_lib: PyAPITestLib, monkeypatch: MonkeyPatch) -> MagicMock:
+    """
+    Records the `subprocess.run` calls made against the test lib, for the few tests that inspect them.
+    """
+    mock_run = MagicMock(side_effect=subprocess.run)
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    return mock_run
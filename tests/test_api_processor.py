@@ -14,24 +14,27 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from pathlib import Path
 from unittest.mock import MagicMock
 
-from pyapi.aexpy_api_processor import AexpyAPIProcessor
+import pytest
+from pytest import MonkeyPatch
+
+from pyapi.aexpy_api_processor import AexpyAPIProcessor, BaselineAPI
 from pyapi.api_processor import APIProcessor
-from pyapi.constants import PYPI_INDEX_URL
+from pyapi.constants import PYAPI_BUILD_DIR, PYAPI_CACHE_SOURCE_API_ENV_VAR
+from tests.conftest import PyAPITestLib
 
 
-def test_check_api_multiple_times_with_no_changes(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", PYPI_INDEX_URL)
+def test_check_api_multiple_times_with_no_changes(test_lib: PyAPITestLib) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
     assert processor.check_api("1.0.0") == []
     assert processor.check_api("1.0.0") == []
 
 
-def test_check_api_multiple_times_with_local_changes(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", PYPI_INDEX_URL)
+def test_check_api_multiple_times_with_local_changes(test_lib: PyAPITestLib) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
     assert processor.check_api("1.0.0") == []
 
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
@@ -43,9 +46,9 @@ def test_check_api_multiple_times_with_local_changes(test_lib: tuple[Path, Magic
     }
 
 
-def test_check_api_non_breaking_change(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", PYPI_INDEX_URL)
+def test_check_api_non_breaking_change(test_lib: PyAPITestLib) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
     functions_path.write_text(
         functions_path.read_text().replace("(a: str, b: str)", '(a: str, b: str, c: str = "foo")')
@@ -54,9 +57,9 @@ def test_check_api_non_breaking_change(test_lib: tuple[Path, MagicMock]) -> None
     assert processor.check_api("1.0.0") == []
 
 
-def test_check_api_breaking_and_non_breaking_change(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", PYPI_INDEX_URL)
+def test_check_api_breaking_and_non_breaking_change(test_lib: PyAPITestLib) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
     functions_path.write_text(
         functions_path.read_text().replace("(a: str, b: str)", '(b: str, a: str, c: str = "foo")')
@@ -68,9 +71,11 @@ def test_check_api_breaking_and_non_breaking_change(test_lib: tuple[Path, MagicM
     }
 
 
-def test_check_api_public_member_of_test_package_does_not_cause_break(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, mock_run = test_lib
-    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", PYPI_INDEX_URL)
+def test_check_api_public_member_of_test_package_does_not_cause_break(
+    test_lib: PyAPITestLib, test_lib_mock_run: MagicMock
+) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
     output_path = test_lib_path / "test_pyapi_lib/_output.py"
     output_path.write_text(
         output_path.read_text().replace("def __init__(self) -> None:", "def __init__(self, description: str) -> None:")
@@ -96,16 +101,99 @@ def test_check_api_public_member_of_test_package_does_not_cause_break(test_lib:
             "test_pyapi_lib",
         ]
         == call[1]["args"]
-        for call in mock_run.call_args_list
+        for call in test_lib_mock_run.call_args_list
     )
 
 
-def test_check_api_public_member_of_main_package_does_cause_break(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", PYPI_INDEX_URL)
+def test_check_api_public_member_of_main_package_does_cause_break(test_lib: PyAPITestLib) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
     output_path = test_lib_path / "test_pyapi_lib/_output.py"
     output_path.write_text(output_path.read_text().replace("def foo() -> str:", "def foo() -> bool:"))
 
     assert set(processor.check_api("1.0.0")) == {
         "ChangeReturnType: Change return type (test_pyapi_lib._output.Utils.foo): builtins.str => builtins.bool"
     }
+
+
+def test_check_api_with_baseline_does_not_process_previous_version(
+    test_lib: PyAPITestLib, test_lib_mock_run: MagicMock, baseline_api_snapshot: BaselineAPI
+) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(
+        test_lib_path, "test-pyapi-lib", test_lib.index_url, baseline=baseline_api_snapshot
+    )
+    functions_path = test_lib_path / "test_pyapi_lib/functions.py"
+    functions_path.write_text(functions_path.read_text().replace("(a: str, b: str)", "(b: str, a: str)"))
+
+    assert set(processor.check_api("1.0.0")) == {
+        "MoveParameter: Move parameter (test_pyapi_lib.functions.special_string_add): b: 2 -> 1.",
+        "MoveParameter: Move parameter (test_pyapi_lib.functions.special_string_add): a: 1 -> 2.",
+    }
+    assert not any(call[1]["args"][:3] == ["python3", "-m", "pip"] for call in test_lib_mock_run.call_args_list)
+    assert not any("-w" in call[1]["args"] for call in test_lib_mock_run.call_args_list)
+
+
+def test_baseline_of_another_project_is_rejected(test_lib: PyAPITestLib, baseline_api_snapshot: BaselineAPI) -> None:
+    with pytest.raises(RuntimeError, match="extracted from test-pyapi-lib, cannot use it to check other-lib"):
+        AexpyAPIProcessor(test_lib.path, "other-lib", test_lib.index_url, baseline=baseline_api_snapshot)
+
+
+def test_check_api_reuses_extracted_source_until_source_changes(
+    test_lib: PyAPITestLib, test_lib_mock_run: MagicMock, baseline_api_snapshot: BaselineAPI, monkeypatch: MonkeyPatch
+) -> None:
+    test_lib_path = test_lib.path
+    monkeypatch.setenv(PYAPI_CACHE_SOURCE_API_ENV_VAR, "true")
+    processor: APIProcessor = AexpyAPIProcessor(
+        test_lib_path, "test-pyapi-lib", test_lib.index_url, baseline=baseline_api_snapshot
+    )
+
+    def source_preprocess_count() -> int:
+        return sum("-s" in call[1]["args"] for call in test_lib_mock_run.call_args_list)
+
+    assert processor.check_api("1.0.0") == []
+    assert source_preprocess_count() == 1
+
+    assert processor.check_api("1.0.0") == []
+    assert source_preprocess_count() == 1
+
+    functions_path = test_lib_path / "test_pyapi_lib/functions.py"
+    functions_path.write_text(functions_path.read_text().replace("(a: str, b: str)", "(b: str, a: str)"))
+
+    assert len(processor.check_api("1.0.0")) == 2
+    assert source_preprocess_count() == 2
+
+    monkeypatch.setattr("pyapi.aexpy_api_processor.version", lambda _: "0.0.0")
+    assert len(processor.check_api("1.0.0")) == 2
+    assert source_preprocess_count() == 3
+    assert len(list((test_lib_path / PYAPI_BUILD_DIR).glob("extracted-test-pyapi-lib-source-*.json"))) == 1
+
+
+def test_check_api_downloads_previous_version_from_index(test_lib: PyAPITestLib, test_lib_mock_run: MagicMock) -> None:
+    test_lib_path = test_lib.path
+    processor: APIProcessor = AexpyAPIProcessor(test_lib_path, "test-pyapi-lib", test_lib.index_url)
+
+    assert processor.check_api("1.0.0") == []
+    pip_commands = [
+        call[1]["args"] for call in test_lib_mock_run.call_args_list if call[1]["args"][:3] == ["python3", "-m", "pip"]
+    ]
+    assert len(pip_commands) == 1
+    assert pip_commands[0][3:7] == ["download", "test-pyapi-lib==1.0.0", "--index-url", test_lib.index_url]
+    assert [wheel.name for wheel in (test_lib_path / PYAPI_BUILD_DIR / "downloads").glob("*.whl")] == [
+        "test_pyapi_lib-1.0.0-py3-none-any.whl"
+    ]
+
+
+def test_check_api_extracts_source_every_time_without_cache_opt_in(
+    test_lib: PyAPITestLib, test_lib_mock_run: MagicMock, baseline_api_snapshot: BaselineAPI, monkeypatch: MonkeyPatch
+) -> None:
+    test_lib_path = test_lib.path
+    monkeypatch.delenv(PYAPI_CACHE_SOURCE_API_ENV_VAR, raising=False)
+    processor: APIProcessor = AexpyAPIProcessor(
+        test_lib_path, "test-pyapi-lib", test_lib.index_url, baseline=baseline_api_snapshot
+    )
+
+    assert processor.check_api("1.0.0") == []
+    assert processor.check_api("1.0.0") == []
+    assert sum("-s" in call[1]["args"] for call in test_lib_mock_run.call_args_list) == 2
+    assert not list((test_lib_path / PYAPI_BUILD_DIR).glob("extracted-test-pyapi-lib-source-*.json"))
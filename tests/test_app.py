@@ -14,264 +14,664 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import sys
-from io import StringIO
 from pathlib import Path
-from textwrap import dedent
-from unittest.mock import MagicMock
+from typing import Any
 
 import pytest
-from pytest import MonkeyPatch
+from pytest import CaptureFixture, MonkeyPatch
 
+from pyapi.aexpy_api_processor import BaselineAPI
 from pyapi.app import PyAPIApplication
 from pyapi.color import ANSIColor
-from pyapi.constants import PYAPI_YML_FILENAME, PYAPI_YML_PATH
+from pyapi.utils import load_yaml
+from tests.conftest import MutateFile, PyAPITestLib
+
+
+def _colored(color: ANSIColor, text: str) -> str:
+    return f"{color.value}{text}{ANSIColor.NO_COLOR.value}"
+
+
+_EXPECTED_ANALYZE_WITH_BREAK_OUTPUT = "\n".join(
+    [
+        _colored(ANSIColor.RED_UNDERLINED, "\nPython API breaks found in test-pyapi-lib:"),
+        _colored(
+            ANSIColor.RED_HIGH_INTENSITY,
+            "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+        ),
+        "You can accept an API break via:",
+        _colored(
+            ANSIColor.CYAN,
+            '  pyapi acceptBreak "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c." ":justification:"',
+        ),
+        "or all API breaks via:",
+        _colored(ANSIColor.CYAN, '  pyapi acceptAllBreaks ":justification:"'),
+        "",
+    ]
+)
+
+_EXPECTED_ANALYZE_WITH_MULTIPLE_BREAKS_OUTPUT = "\n".join(
+    [
+        "",
+        "Python API breaks found in test-pyapi-lib:",
+        "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.",
+        "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow",
+        "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+        "ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int",
+        "You can accept an API break via:",
+        '  pyapi acceptBreak "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False." ":justification:"',
+        "or all API breaks via:",
+        '  pyapi acceptAllBreaks ":justification:"',
+        "",
+    ]
+)
+
+_EXISTING_SAME_VERSION_YML = """\
+acceptedBreaks:
+  0.191.0:
+    test-pyapi-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+  1.0.0:
+    test-pyapi-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+versionOverrides: {}
+"""
 
+_EXISTING_OLDER_AND_NEWER_VERSIONS_YML = """\
+acceptedBreaks:
+  0.9.0:
+    test-pyapi-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+  1.1.0:
+    test-pyapi-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+versionOverrides: {}
+"""
 
-def test_analyze_no_code_change(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    app = PyAPIApplication(test_lib_path)
+_EXISTING_NEWER_VERSIONS_YML = """\
+acceptedBreaks:
+  1.0.1:
+    test-pyapi-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+  5.302.0:
+    test-pyapi-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+versionOverrides: {}
+"""
 
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+_EXISTING_OLDER_VERSIONS_YML = """\
+acceptedBreaks:
+  0.1.0:
+    test-pyapi-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+  0.999.999:
+    test-pyapi-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+versionOverrides: {}
+"""
 
-    app.analyze()
+_EXISTING_OTHER_PROJECTS_ON_SAME_VERSION_YML = """\
+acceptedBreaks:
+  1.0.0:
+    other-test-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+    very-cool-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+versionOverrides: {}
+"""
 
-    assert captured_output.getvalue() == "No Python API breaks found.\n"
+_EXISTING_OTHER_PROJECTS_ON_DIFFERENT_VERSION_YML = """\
+acceptedBreaks:
+  0.9.0:
+    other-test-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+    very-cool-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+versionOverrides: {}
+"""
 
-    sys.stdout = sys.__stdout__  # Reset stdout
+_VERSION_OVERRIDE_YML = """\
+acceptedBreaks: {}
+versionOverrides:
+  1.0.0: 0.9.0
+"""
 
+_ALREADY_ACCEPTED_YML = """\
+acceptedBreaks:
+  1.0.0:
+    test-pyapi-lib:
+    - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
+      justification: previous acceptance
+versionOverrides: {}
+"""
 
-def test_analyze_no_breaks(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    app = PyAPIApplication(test_lib_path)
-    animals_path = test_lib_path / "test_pyapi_lib/animals.py"
-    animals_path.write_text(
-        animals_path.read_text().replace(
-            'def meow(self) -> None:\n        print("meow")',
-            'def meow(self) -> None:\n        print("meow")\n\ndef purr(self) -> None:\n        print("purr")',
-        )
-    )
+_EXPECTED_ACCEPT_BREAK_WITH_BREAK_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ]
+        }
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_ACCEPT_BREAK_WITH_MULTIPLE_BREAKS_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow",
+                    "justification": "meow is never used",
+                }
+            ]
+        }
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_ACCEPT_BREAK_WITH_MULTIPLE_BREAKS_OUTPUT = "\n".join(
+    [
+        "",
+        "Python API breaks found in test-pyapi-lib:",
+        "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.",
+        "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+        "ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int",
+        "You can accept an API break via:",
+        '  pyapi acceptBreak "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False." ":justification:"',
+        "or all API breaks via:",
+        '  pyapi acceptAllBreaks ":justification:"',
+        "",
+    ]
+)
+
+_EXPECTED_ACCEPT_ALL_BREAKS_WITH_BREAK_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ]
+        }
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_ACCEPT_ALL_BREAKS_WITH_MULTIPLE_BREAKS_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.",
+                    "justification": "these are all irrelevant",
+                },
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow",
+                    "justification": "these are all irrelevant",
+                },
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "these are all irrelevant",
+                },
+                {
+                    "code": "ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int",
+                    "justification": "these are all irrelevant",
+                },
+            ]
+        }
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_ACCEPT_ALL_BREAKS_WITH_MULTIPLE_BREAKS_YML_TEXT = """\
+acceptedBreaks:
+  1.0.0:
+    test-pyapi-lib:
+    - code: 'RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.'
+      justification: these are all irrelevant
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow'
+      justification: these are all irrelevant
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: these are all irrelevant
+    - code: 'ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int'
+      justification: these are all irrelevant
+versionOverrides: {}
+"""
+
+_EXPECTED_SAME_VERSION_YML = {
+    "acceptedBreaks": {
+        "0.191.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr",
+                    "justification": "no purrs allowed",
+                }
+            ]
+        },
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "previous acceptance",
+                },
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                },
+            ]
+        },
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_OLDER_AND_NEWER_VERSIONS_YML = {
+    "acceptedBreaks": {
+        "0.9.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr",
+                    "justification": "no purrs allowed",
+                }
+            ]
+        },
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ]
+        },
+        "1.1.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "previous acceptance",
+                }
+            ]
+        },
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_OLDER_AND_NEWER_VERSIONS_YML_TEXT = """\
+acceptedBreaks:
+  0.9.0:
+    test-pyapi-lib:
+    - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
+      justification: no purrs allowed
+  1.0.0:
+    test-pyapi-lib:
+    - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
+      justification: basic justification
+  1.1.0:
+    test-pyapi-lib:
+    - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
+      justification: previous acceptance
+versionOverrides: {}
+"""
 
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+_EXPECTED_NEWER_VERSIONS_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ]
+        },
+        "1.0.1": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr",
+                    "justification": "no purrs allowed",
+                }
+            ]
+        },
+        "5.302.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "previous acceptance",
+                }
+            ]
+        },
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_OLDER_VERSIONS_YML = {
+    "acceptedBreaks": {
+        "0.1.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr",
+                    "justification": "no purrs allowed",
+                }
+            ]
+        },
+        "0.999.999": {
+            "test-pyapi-lib": [
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "previous acceptance",
+                }
+            ]
+        },
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ]
+        },
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_OTHER_PROJECTS_ON_SAME_VERSION_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "other-test-lib": [
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "previous acceptance",
+                }
+            ],
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ],
+            "very-cool-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr",
+                    "justification": "no purrs allowed",
+                }
+            ],
+        }
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_OTHER_PROJECTS_ON_DIFFERENT_VERSION_YML = {
+    "acceptedBreaks": {
+        "0.9.0": {
+            "other-test-lib": [
+                {
+                    "code": "RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.",
+                    "justification": "previous acceptance",
+                }
+            ],
+            "very-cool-lib": [
+                {
+                    "code": "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr",
+                    "justification": "no purrs allowed",
+                }
+            ],
+        },
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
+                    "justification": "basic justification",
+                }
+            ]
+        },
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_ACCEPT_ALL_BREAKS_WITH_BREAK_THAT_HAS_SINGLE_QUOTE_IN_CODE_YML = {
+    "acceptedBreaks": {
+        "1.0.0": {
+            "test-pyapi-lib": [
+                {
+                    "code": "ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_int_subtract): b: builtins.int => builtins.str",
+                    "justification": "another justification",
+                }
+            ]
+        }
+    },
+    "versionOverrides": {},
+}
+
+_EXPECTED_VERSION_OVERRIDE_0_9_0_YML = {"acceptedBreaks": {}, "versionOverrides": {"1.0.0": "0.9.0"}}
+
+_EXPECTED_VERSION_OVERRIDE_0_8_0_YML = {"acceptedBreaks": {}, "versionOverrides": {"1.0.0": "0.8.0"}}
+
+
+def _with_ordered_keys(value: Any) -> Any:
+    if isinstance(value, dict):
+        return [(key, _with_ordered_keys(item)) for key, item in value.items()]
+    if isinstance(value, list):
+        return [_with_ordered_keys(item) for item in value]
+    return value
+
+
+def assert_yaml_equal(path: Path, expected: dict[str, Any]) -> None:
+    """
+    Compares the parsed YAML and the order of its keys at every level, but not its formatting.
+    Tests pinning the exact serialized pyapi.yml compare the file's text instead.
+    """
+    actual = load_yaml(path.read_bytes())
+    assert actual == expected
+    assert _with_ordered_keys(actual) == _with_ordered_keys(expected)
+
+
+def test_analyze_no_code_change(
+    test_lib: PyAPITestLib, baseline_api_snapshot: BaselineAPI, capsys: CaptureFixture[str]
+) -> None:
+    test_lib_path = test_lib.path
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.analyze()
 
-    assert captured_output.getvalue() == "No Python API breaks found.\n"
+    assert capsys.readouterr().out == "No Python API breaks found.\n"
 
-    sys.stdout = sys.__stdout__  # Reset stdout
 
+def test_analyze_no_breaks(
+    test_lib: PyAPITestLib,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
+    animals_path = test_lib_path / "test_pyapi_lib/animals.py"
+    mutate(
+        animals_path,
+        (
+            b'def meow(self) -> None:\n        return self._vocalize("meow")',
+            b'def meow(self) -> None:\n        return self._vocalize("meow")\n\n'
+            b'    def purr(self) -> None:\n        return self._vocalize("purr")',
+        ),
+    )
+
+    app.analyze()
 
-def test_analyze_with_break(test_lib: tuple[Path, MagicMock], monkeypatch: MonkeyPatch) -> None:
-    test_lib_path, _ = test_lib
+    assert capsys.readouterr().out == "No Python API breaks found.\n"
+
+
+def test_analyze_with_break(
+    test_lib: PyAPITestLib,
+    monkeypatch: MonkeyPatch,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     monkeypatch.delenv("CI", raising=False)
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    app = PyAPIApplication(test_lib_path)
-
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     with pytest.raises(SystemExit) as cm:
         app.analyze()
 
     assert cm.value.code == 1
-    assert captured_output.getvalue() == dedent(f"""\
-    {ANSIColor.RED_UNDERLINED.value}
-    Python API breaks found in test-pyapi-lib:{ANSIColor.NO_COLOR.value}
-    {ANSIColor.RED_HIGH_INTENSITY.value}AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.{ANSIColor.NO_COLOR.value}
-    You can accept an API break via:
-    {ANSIColor.CYAN.value}  pyapi acceptBreak "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c." ":justification:"{ANSIColor.NO_COLOR.value}
-    or all API breaks via:
-    {ANSIColor.CYAN.value}  pyapi acceptAllBreaks ":justification:"{ANSIColor.NO_COLOR.value}
-    """)
-
-    sys.stdout = sys.__stdout__  # Reset stdout
+    assert capsys.readouterr().out == _EXPECTED_ANALYZE_WITH_BREAK_OUTPUT
 
 
-def test_analyze_with_multiple_breaks(test_lib: tuple[Path, MagicMock], monkeypatch: MonkeyPatch) -> None:
-    test_lib_path, _ = test_lib
+def test_analyze_with_multiple_breaks(
+    test_lib: PyAPITestLib,
+    monkeypatch: MonkeyPatch,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     monkeypatch.setenv("CI", "true")
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: str, b: str)", "(a: int)"))
+    mutate(functions_path, (b"(a: str, b: str)", b"(a: int)"))
     animals_path = test_lib_path / "test_pyapi_lib/animals.py"
-    animals_path.write_text(
-        animals_path.read_text()
-        .replace('def meow(self) -> None:\n        return self._vocalize("meow")', "")
-        .replace("is_mammal: bool = True", "is_mammal: bool")
+    mutate(
+        animals_path,
+        (b'def meow(self) -> None:\n        return self._vocalize("meow")', b""),
+        (b"is_mammal: bool = True", b"is_mammal: bool"),
     )
-    app = PyAPIApplication(test_lib_path)
-
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     with pytest.raises(SystemExit) as cm:
         app.analyze()
 
     assert cm.value.code == 1
-    assert captured_output.getvalue() == dedent("""
-    Python API breaks found in test-pyapi-lib:
-    RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.
-    RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow
-    RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.
-    ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int
-    You can accept an API break via:
-      pyapi acceptBreak "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False." ":justification:"
-    or all API breaks via:
-      pyapi acceptAllBreaks ":justification:"
-    """)
-
-    sys.stdout = sys.__stdout__  # Reset stdout
+    assert capsys.readouterr().out == _EXPECTED_ANALYZE_WITH_MULTIPLE_BREAKS_OUTPUT
 
 
 @pytest.mark.parametrize("test_lib", [{"current_git_version": b"1.0.0"}], indirect=True)
-def test_analyze_on_release_version(test_lib: tuple[Path, MagicMock], monkeypatch: MonkeyPatch) -> None:
-    test_lib_path, _ = test_lib
+def test_analyze_on_release_version(
+    test_lib: PyAPITestLib,
+    monkeypatch: MonkeyPatch,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     monkeypatch.setenv("CI", "true")
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: str, b: str)", "(a: int)"))
-    app = PyAPIApplication(test_lib_path)
-
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+    mutate(functions_path, (b"(a: str, b: str)", b"(a: int)"))
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.analyze()
 
     assert (
-        captured_output.getvalue()
+        capsys.readouterr().out
         == "Current version is the same as the previous version, this is a release version, skipping analysis.\n"
     )
 
-    sys.stdout = sys.__stdout__  # Reset stdout
-
 
-def test_analyze_with_version_override(test_lib: tuple[Path, MagicMock], monkeypatch: MonkeyPatch) -> None:
-    test_lib_path, _ = test_lib
+def test_analyze_with_version_override(
+    test_lib: PyAPITestLib,
+    monkeypatch: MonkeyPatch,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     monkeypatch.setenv("CI", "true")
-    app = PyAPIApplication(test_lib_path)
-    pyapi_yml_file = test_lib_path / ".." / PYAPI_YML_PATH
-    (test_lib_path / ".." / ".palantir").mkdir()
-    pyapi_yml_file.write_text(
-        dedent("""
-    acceptedBreaks: {}
-    versionOverrides:
-      1.0.0: 0.9.0
-    """)
-    )
-
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
+    pyapi_yml_file = test_lib.pyapi_yml_path
+    pyapi_yml_file.write_bytes(_VERSION_OVERRIDE_YML.encode())
 
-    # Just check that it tries to download the correct version, this wheel doesn't exist so it will fail.
+    # Just check that it tries to download the correct version, the local index only has 1.0.0 so pip fails to find it.
     with pytest.raises(SystemExit) as cm:
         app.analyze()
 
     assert cm.value.code == 1
-    output = captured_output.getvalue()
-    assert "Failed to download test-pyapi-lib 0.9.0 from Python index." in output
+    output = capsys.readouterr().out
+    assert "Cannot find test-pyapi-lib 0.9.0 in Python index." in output
     assert (
         "If the above version was tagged but failed to publish, apply a version override via:\n  pyapi versionOverride <last-published-version>\n"
         in output
     )
 
-    sys.stdout = sys.__stdout__  # Reset stdout
-
 
-def test_accept_break_with_break(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_break_with_break(
+    test_lib: PyAPITestLib, mutate: MutateFile, baseline_api_snapshot: BaselineAPI
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    pyapi_yml_path = test_lib_path / ".." / PYAPI_YML_PATH
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    pyapi_yml_path = test_lib.pyapi_yml_path
     assert not pyapi_yml_path.exists()
-    app = PyAPIApplication(test_lib_path)
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_break(
         "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
         "basic justification",
     )
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-    versionOverrides: {}
-    """)
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_ACCEPT_BREAK_WITH_BREAK_YML)
 
 
-def test_accept_break_with_multiple_breaks(test_lib: tuple[Path, MagicMock], monkeypatch: MonkeyPatch) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_break_with_multiple_breaks(
+    test_lib: PyAPITestLib,
+    monkeypatch: MonkeyPatch,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     monkeypatch.setenv("CI", "true")
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: str, b: str)", "(a: int)"))
+    mutate(functions_path, (b"(a: str, b: str)", b"(a: int)"))
     animals_path = test_lib_path / "test_pyapi_lib/animals.py"
-    animals_path.write_text(
-        animals_path.read_text()
-        .replace('def meow(self) -> None:\n        return self._vocalize("meow")', "")
-        .replace("is_mammal: bool = True", "is_mammal: bool")
+    mutate(
+        animals_path,
+        (b'def meow(self) -> None:\n        return self._vocalize("meow")', b""),
+        (b"is_mammal: bool = True", b"is_mammal: bool"),
     )
-    pyapi_yml_path = test_lib_path / ".." / PYAPI_YML_PATH
+    pyapi_yml_path = test_lib.pyapi_yml_path
     assert not pyapi_yml_path.exists()
-    app = PyAPIApplication(test_lib_path)
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_break(
         "RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow",
         "meow is never used",
     )
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow'
-          justification: meow is never used
-    versionOverrides: {}
-    """)
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_ACCEPT_BREAK_WITH_MULTIPLE_BREAKS_YML)
 
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
-
-    app = PyAPIApplication(test_lib_path)  # Recreate app for new command.
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)  # Recreate app for new command.
     with pytest.raises(SystemExit) as cm:
         app.analyze()
 
     assert cm.value.code == 1
-    assert captured_output.getvalue() == dedent("""
-    Python API breaks found in test-pyapi-lib:
-    RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.
-    RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.
-    ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int
-    You can accept an API break via:
-      pyapi acceptBreak "RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False." ":justification:"
-    or all API breaks via:
-      pyapi acceptAllBreaks ":justification:"
-    """)
-
-    sys.stdout = sys.__stdout__  # Reset stdout
-
-
-def test_accept_break_that_is_already_accepted(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+    assert capsys.readouterr().out == _EXPECTED_ACCEPT_BREAK_WITH_MULTIPLE_BREAKS_OUTPUT
+
+
+def test_accept_break_that_is_already_accepted(
+    test_lib: PyAPITestLib,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_text = dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-    pyapi_yml_path.write_text(pyapi_yml_text)
-    app = PyAPIApplication(test_lib_path)
-
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    pyapi_yml_path = test_lib.pyapi_yml_path
+    pyapi_yml_text = _ALREADY_ACCEPTED_YML
+    pyapi_yml_path.write_bytes(pyapi_yml_text.encode())
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_break(
         "AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.",
@@ -279,392 +679,176 @@ def test_accept_break_that_is_already_accepted(test_lib: tuple[Path, MagicMock])
     )
 
     assert (
-        captured_output.getvalue()
+        capsys.readouterr().out
         == "Break 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.' is already accepted\n"
     )
 
     assert pyapi_yml_path.read_text() == pyapi_yml_text
 
-    sys.stdout = sys.__stdout__  # Reset stdout
-
 
-def test_accept_break_invalid_break(test_lib: tuple[Path, MagicMock], monkeypatch: MonkeyPatch) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_break_invalid_break(
+    test_lib: PyAPITestLib,
+    monkeypatch: MonkeyPatch,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    capsys: CaptureFixture[str],
+) -> None:
+    test_lib_path = test_lib.path
     monkeypatch.delenv("CI", raising=False)
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    app = PyAPIApplication(test_lib_path)
-
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     with pytest.raises(SystemExit) as cm:
         app.accept_break("a break", "my just")
 
     assert cm.value.code == 1
     assert (
-        captured_output.getvalue()
-        == f"{ANSIColor.RED.value}\nBreak 'a break' is not a valid Python API break and cannot be accepted{ANSIColor.NO_COLOR.value}\n"
+        capsys.readouterr().out
+        == _colored(ANSIColor.RED, "\nBreak 'a break' is not a valid Python API break and cannot be accepted") + "\n"
     )
 
 
-def test_accept_all_breaks_with_break(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_all_breaks_with_break(
+    test_lib: PyAPITestLib, mutate: MutateFile, baseline_api_snapshot: BaselineAPI
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    pyapi_yml_path = test_lib_path / ".." / PYAPI_YML_PATH
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    pyapi_yml_path = test_lib.pyapi_yml_path
     assert not pyapi_yml_path.exists()
-    app = PyAPIApplication(test_lib_path)
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_all_breaks("basic justification")
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-    versionOverrides: {}
-    """)
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_ACCEPT_ALL_BREAKS_WITH_BREAK_YML)
 
 
-def test_accept_all_breaks_with_multiple_breaks(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_all_breaks_with_multiple_breaks(
+    test_lib: PyAPITestLib, mutate: MutateFile, baseline_api_snapshot: BaselineAPI
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: str, b: str)", "(a: int)"))
+    mutate(functions_path, (b"(a: str, b: str)", b"(a: int)"))
     animals_path = test_lib_path / "test_pyapi_lib/animals.py"
-    animals_path.write_text(
-        animals_path.read_text()
-        .replace('def meow(self) -> None:\n        return self._vocalize("meow")', "")
-        .replace("is_mammal: bool = True", "is_mammal: bool")
+    mutate(
+        animals_path,
+        (b'def meow(self) -> None:\n        return self._vocalize("meow")', b""),
+        (b"is_mammal: bool = True", b"is_mammal: bool"),
     )
-    pyapi_yml_path = test_lib_path / ".." / PYAPI_YML_PATH
+    pyapi_yml_path = test_lib.pyapi_yml_path
     assert not pyapi_yml_path.exists()
-    app = PyAPIApplication(test_lib_path)
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_all_breaks("these are all irrelevant")
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'RemoveParameterDefault: Switch parameter optional (test_pyapi_lib.animals.Animal.__init__): is_mammal: True -> False.'
-          justification: these are all irrelevant
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): meow'
-          justification: these are all irrelevant
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: these are all irrelevant
-        - code: 'ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_string_add): a: builtins.str => builtins.int'
-          justification: these are all irrelevant
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_and_existing_accepted(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_path.write_text(
-        dedent("""\
-    acceptedBreaks:
-      0.191.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-    )
-    app = PyAPIApplication(test_lib_path)
-
-    app.accept_all_breaks("basic justification")
-
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      0.191.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_and_older_and_newer_existing_accepted(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_path.write_text(
-        dedent("""\
-    acceptedBreaks:
-      0.9.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      1.1.0:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-    )
-
-    app = PyAPIApplication(test_lib_path)
-
-    app.accept_all_breaks("basic justification")
-
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      0.9.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-      1.1.0:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_and_newer_existing_accepted(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_ACCEPT_ALL_BREAKS_WITH_MULTIPLE_BREAKS_YML)
+    # Long codes must stay on a single line.
+    assert pyapi_yml_path.read_text() == _EXPECTED_ACCEPT_ALL_BREAKS_WITH_MULTIPLE_BREAKS_YML_TEXT
+
+
+@pytest.mark.parametrize(
+    "existing_pyapi_yml,expected_pyapi_yml",
+    [
+        pytest.param(
+            _EXISTING_SAME_VERSION_YML,
+            _EXPECTED_SAME_VERSION_YML,
+            id="same_version",
+        ),
+        pytest.param(
+            _EXISTING_OLDER_AND_NEWER_VERSIONS_YML,
+            _EXPECTED_OLDER_AND_NEWER_VERSIONS_YML,
+            id="older_and_newer_versions",
+        ),
+        pytest.param(
+            _EXISTING_NEWER_VERSIONS_YML,
+            _EXPECTED_NEWER_VERSIONS_YML,
+            id="newer_versions",
+        ),
+        pytest.param(
+            _EXISTING_OLDER_VERSIONS_YML,
+            _EXPECTED_OLDER_VERSIONS_YML,
+            id="older_versions",
+        ),
+        pytest.param(
+            _EXISTING_OTHER_PROJECTS_ON_SAME_VERSION_YML,
+            _EXPECTED_OTHER_PROJECTS_ON_SAME_VERSION_YML,
+            id="other_projects_on_same_version",
+        ),
+        pytest.param(
+            _EXISTING_OTHER_PROJECTS_ON_DIFFERENT_VERSION_YML,
+            _EXPECTED_OTHER_PROJECTS_ON_DIFFERENT_VERSION_YML,
+            id="other_projects_on_different_version",
+        ),
+    ],
+)
+def test_accept_all_breaks_with_break_and_existing_accepted(
+    test_lib: PyAPITestLib,
+    mutate: MutateFile,
+    baseline_api_snapshot: BaselineAPI,
+    existing_pyapi_yml: str,
+    expected_pyapi_yml: dict[str, Any],
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_path.write_text(
-        dedent("""\
-    acceptedBreaks:
-      1.0.1:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      5.302.0:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-    )
-
-    app = PyAPIApplication(test_lib_path)
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    pyapi_yml_path = test_lib.pyapi_yml_path
+    pyapi_yml_path.write_bytes(existing_pyapi_yml.encode())
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_all_breaks("basic justification")
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-      1.0.1:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      5.302.0:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_and_older_existing_accepted(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_path.write_text(
-        dedent("""\
-    acceptedBreaks:
-      0.1.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      0.999.999:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-    versionOverrides: {}
-    """)
-    )
-
-    app = PyAPIApplication(test_lib_path)
+    assert_yaml_equal(pyapi_yml_path, expected_pyapi_yml)
 
-    app.accept_all_breaks("basic justification")
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      0.1.0:
-        test-pyapi-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      0.999.999:
-        test-pyapi-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_and_other_projects_for_same_version(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_all_breaks_with_break_and_older_and_newer_existing_accepted_writes_sorted_versions(
+    test_lib: PyAPITestLib, mutate: MutateFile, baseline_api_snapshot: BaselineAPI
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_path.write_text(
-        dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        other-test-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-        very-cool-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-    versionOverrides: {}
-    """)
-    )
-
-    app = PyAPIApplication(test_lib_path)
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: int, c: int)"))
+    pyapi_yml_path = test_lib.pyapi_yml_path
+    pyapi_yml_path.write_bytes(_EXISTING_OLDER_AND_NEWER_VERSIONS_YML.encode())
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_all_breaks("basic justification")
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        other-test-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-        very-cool-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_and_other_projects_on_different_version(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: int, c: int)"))
-    palantir_path = test_lib_path / ".." / ".palantir"
-    palantir_path.mkdir(parents=True)
-    pyapi_yml_path = palantir_path / PYAPI_YML_FILENAME
-    pyapi_yml_path.write_text(
-        dedent("""\
-    acceptedBreaks:
-      0.9.0:
-        other-test-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-        very-cool-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-    versionOverrides: {}
-    """)
-    )
+    assert pyapi_yml_path.read_text() == _EXPECTED_OLDER_AND_NEWER_VERSIONS_YML_TEXT
 
-    app = PyAPIApplication(test_lib_path)
 
-    app.accept_all_breaks("basic justification")
-
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      0.9.0:
-        other-test-lib:
-        - code: 'RemoveRequiredParameter: Remove PositionalOrKeyword parameter (test_pyapi_lib.functions.special_string_add): b.'
-          justification: previous acceptance
-        very-cool-lib:
-        - code: 'RemoveMethod: Remove method (test_pyapi_lib.animals.Cat): purr'
-          justification: no purrs allowed
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'AddRequiredParameter: Add PositionalOrKeyword parameter (test_pyapi_lib.functions.special_int_subtract): c.'
-          justification: basic justification
-    versionOverrides: {}
-    """)
-
-
-def test_accept_all_breaks_with_break_that_has_single_quote_in_code(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
+def test_accept_all_breaks_with_break_that_has_single_quote_in_code(
+    test_lib: PyAPITestLib, mutate: MutateFile, baseline_api_snapshot: BaselineAPI
+) -> None:
+    test_lib_path = test_lib.path
     functions_path = test_lib_path / "test_pyapi_lib/functions.py"
-    functions_path.write_text(functions_path.read_text().replace("(a: int, b: int)", "(a: int, b: 'str')"))
-    pyapi_yml_path = test_lib_path / ".." / PYAPI_YML_PATH
+    mutate(functions_path, (b"(a: int, b: int)", b"(a: int, b: 'str')"))
+    pyapi_yml_path = test_lib.pyapi_yml_path
     assert not pyapi_yml_path.exists()
-    app = PyAPIApplication(test_lib_path)
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_all_breaks("another justification")
 
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks:
-      1.0.0:
-        test-pyapi-lib:
-        - code: 'ChangeParameterType: Change parameter type (test_pyapi_lib.functions.special_int_subtract): b: builtins.int => builtins.str'
-          justification: another justification
-    versionOverrides: {}
-    """)
-
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_ACCEPT_ALL_BREAKS_WITH_BREAK_THAT_HAS_SINGLE_QUOTE_IN_CODE_YML)
 
-def test_accept_all_breaks_no_breaks(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    app = PyAPIApplication(test_lib_path)
 
-    captured_output = StringIO()
-    sys.stdout = captured_output  # Redirect stdout.
+def test_accept_all_breaks_no_breaks(
+    test_lib: PyAPITestLib, baseline_api_snapshot: BaselineAPI, capsys: CaptureFixture[str]
+) -> None:
+    test_lib_path = test_lib.path
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
 
     app.accept_all_breaks("why not")
 
-    assert captured_output.getvalue() == "No Python API breaks found to accept.\n"
-
-    sys.stdout = sys.__stdout__  # Reset stdout
+    assert capsys.readouterr().out == "No Python API breaks found to accept.\n"
 
 
-def test_version_overrides_writes_overrides(test_lib: tuple[Path, MagicMock]) -> None:
-    test_lib_path, _ = test_lib
-    app = PyAPIApplication(test_lib_path)
-    pyapi_yml_path = test_lib_path / ".." / PYAPI_YML_PATH
+def test_version_overrides_writes_overrides(test_lib: PyAPITestLib, baseline_api_snapshot: BaselineAPI) -> None:
+    test_lib_path = test_lib.path
+    app = PyAPIApplication(test_lib_path, baseline=baseline_api_snapshot)
+    pyapi_yml_path = test_lib.pyapi_yml_path
 
     app.version_override("0.9.0")
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks: {}
-    versionOverrides:
-      1.0.0: 0.9.0
-    """)
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_VERSION_OVERRIDE_0_9_0_YML)
 
     app.version_override("0.8.0")
-    assert pyapi_yml_path.read_text() == dedent("""\
-    acceptedBreaks: {}
-    versionOverrides:
-      1.0.0: 0.8.0
-    """)
+    assert_yaml_equal(pyapi_yml_path, _EXPECTED_VERSION_OVERRIDE_0_8_0_YML)